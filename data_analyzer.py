@@ -6,145 +6,372 @@ Analyzes and reports on scraped TikTok data
 
 import json
 import argparse
+import gzip
+import heapq
+import mmap
+import os
 from pathlib import Path
 from collections import defaultdict, Counter
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, List, Any
+from operator import itemgetter
+from typing import Callable, Dict, Iterable, List, Any, Optional, Tuple
 import re
 
+# Optional fast JSON backends
+try:
+    import simdjson
+    SIMDJSON_AVAILABLE = True
+except ImportError:
+    SIMDJSON_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Optional multi-pattern matcher for searching several queries at once
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# Script detection patterns used by the comment analysis
+ARABIC_RE = re.compile(r'[\u0600-\u06FF\u0750-\u077F\u08A0-\u08FF\uFB50-\uFDFF\uFE70-\uFEFF]')
+ENGLISH_RE = re.compile(r'[a-zA-Z]')
+WORD_RE = re.compile(r'\b\w+\b')
+
+# Fields read by the report/search code - anything else in a JSON event is dropped at load time
+EVENT_FIELDS = ('timestamp', 'event_type', 'streamer', 'user', 'content')
+
+# Column layout of the loaded data: event fields plus the timestamp parts cached at load time
+COLUMNS = EVENT_FIELDS + ('ts_epoch', 'ts_hour', 'ts_day')
+NO_TIMESTAMP = (None, None, None)
+
+# Data file name prefixes (old and new format)
+DATA_FILE_PREFIXES = ('tiktok-rawdata-', 'tiktok-comments-')
+
+# Text-format event markers, keyed by first character so classification is one dict lookup.
+# '❤️' is two code points (heart + variation selector), hence the full-marker startswith check.
+EVENT_MARKERS = {marker[0]: (marker, event_type)
+                 for marker, event_type in (('❤️', 'like'), ('🔄', 'share'), ('➕', 'follow'))}
+
+# Low-cardinality columns whose values are deduplicated into shared string objects
+CATEGORICAL_COLUMNS = frozenset({'event_type', 'streamer', 'user'})
+# user is only pooled when it repeats enough: distinct users / rows below this ratio
+USER_POOL_MAX_RATIO = 0.5
+
+# Reusable simdjson parser amortizes buffer allocation across lines (one per process)
+_JSON_PARSER = simdjson.Parser() if SIMDJSON_AVAILABLE else None
+
+def _parse_json_line(raw_line: bytes) -> Dict[str, Any]:
+    """Parse a JSON event line, keeping only the fields the analyzer uses"""
+    if _JSON_PARSER is not None:
+        doc = _JSON_PARSER.parse(raw_line)
+        # Objects/arrays come back as proxies bound to the (reused) parser buffer - copy them
+        # out so they survive the next parse and can be pickled back from worker processes
+        fields = {}
+        for key in EVENT_FIELDS:
+            if key in doc:
+                value = doc[key]
+                if isinstance(value, simdjson.Object):
+                    value = value.as_dict()
+                elif isinstance(value, simdjson.Array):
+                    value = value.as_list()
+                fields[key] = value
+        return fields
+        
+    if ORJSON_AVAILABLE:
+        doc = orjson.loads(raw_line)
+    else:
+        doc = json.loads(raw_line)
+    return {key: doc[key] for key in EVENT_FIELDS if key in doc}
+
+def _json_dumps(obj: Any, indent: bool = False) -> bytes:
+    """Serialize to UTF-8 JSON bytes with a trailing newline"""
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    return (json.dumps(obj, indent=2 if indent else None, ensure_ascii=False) + '\n').encode('utf-8')
+
+def _parse_timestamp(timestamp_str: Any) -> tuple:
+    """Parse an ISO timestamp once into the (epoch, hour, day) columns the report reads"""
+    try:
+        dt = datetime.fromisoformat(timestamp_str)
+    except (TypeError, ValueError):
+        return NO_TIMESTAMP
+    return dt.timestamp(), dt.hour, dt.strftime('%Y-%m-%d')
+
+def _text_event_type(user: str, content: str) -> str:
+    """Determine the event type of a text-format line based on its content"""
+    if user == 'SYSTEM':
+        return 'system'
+    marker = EVENT_MARKERS.get(content[:1])
+    return marker[1] if marker and content.startswith(marker[0]) else 'comment'
+
+def _line_parser(first_line: bytes, file_streamer: str, file_time_iso: str) -> Callable[[bytes], Optional[tuple]]:
+    """
+    Pick a per-line parser for one file based on its first line. Files hold a single format,
+    so the returned closure handles that format directly with the file's streamer and
+    fallback timestamp bound in; lines that don't fit go through the generic dispatch.
+    Parsers return a row tuple in COLUMNS order, or None for a malformed line.
+    """
+    file_ts_fields = _parse_timestamp(file_time_iso)
+    
+    def json_row(raw_line: bytes) -> tuple:
+        data = _parse_json_line(raw_line)
+        timestamp_str = data.get('timestamp')
+        return (
+            timestamp_str, data.get('event_type', 'unknown'), data.get('streamer', 'unknown'),
+            data.get('user'), data.get('content'),
+            *_parse_timestamp(timestamp_str)
+        )
+        
+    def text2_row(parts: List[bytes]) -> tuple:
+        # New format: user|content (no timestamp) - use file time as timestamp
+        user, content = parts[0].decode('utf-8'), parts[1].decode('utf-8')
+        return (
+            file_time_iso, _text_event_type(user, content), file_streamer, user, content,
+            *file_ts_fields
+        )
+        
+    def text3_row(parts: List[bytes]) -> tuple:
+        # Old format: timestamp|user|content
+        timestamp_str, user, content = (part.decode('utf-8') for part in parts)
+        return (
+            timestamp_str, _text_event_type(user, content), file_streamer, user, content,
+            *_parse_timestamp(timestamp_str)
+        )
+        
+    def parse_any(raw_line: bytes) -> Optional[tuple]:
+        # Try to parse as JSON first (new format), then both text formats.
+        # Splitting before decoding is safe: b'|' never occurs inside a UTF-8 sequence
+        if raw_line.startswith(b'{'):
+            return json_row(raw_line)
+        parts = raw_line.split(b'|')
+        if len(parts) == 2:
+            return text2_row(parts)
+        if len(parts) == 3:
+            return text3_row(parts)
+        # Skip malformed lines
+        return None
+        
+    def parse_json(raw_line: bytes) -> Optional[tuple]:
+        if raw_line.startswith(b'{'):
+            return json_row(raw_line)
+        return parse_any(raw_line)
+        
+    def parse_text2(raw_line: bytes) -> Optional[tuple]:
+        parts = raw_line.split(b'|')
+        if len(parts) == 2:
+            return text2_row(parts)
+        return parse_any(raw_line)
+        
+    def parse_text3(raw_line: bytes) -> Optional[tuple]:
+        parts = raw_line.split(b'|')
+        if len(parts) == 3:
+            return text3_row(parts)
+        return parse_any(raw_line)
+        
+    if first_line.startswith(b'{'):
+        return parse_json
+    pipes = first_line.count(b'|')
+    if pipes == 1:
+        return parse_text2
+    if pipes == 2:
+        return parse_text3
+    return parse_any
+
+def _parse_file(file_path: Path, file_time: datetime) -> Tuple[Optional[List[tuple]], Optional[Counter], List[str]]:
+    """
+    Parse one data file into rows (tuples in COLUMNS order), per-(streamer, event_type)
+    counts and any messages to print. Top-level so it can run in a worker process;
+    rows and counts are None if the file could not be read.
+    """
+    messages = []
+    try:
+        # Streamer and fallback timestamp are per-file, derive them once
+        filename = file_path.name
+        if filename.startswith('tiktok-rawdata-'):
+            file_streamer = filename.removeprefix('tiktok-rawdata-').split('-', 1)[0]
+        elif filename.startswith('tiktok-comments-'):
+            file_streamer = filename.removeprefix('tiktok-comments-').split('-', 1)[0]
+        else:
+            file_streamer = 'unknown'
+        file_time_iso = file_time.isoformat()
+        
+        file_rows = []
+        file_counts = Counter()
+        
+        # mmap can't map an empty file, and there is nothing to parse anyway
+        if file_path.stat().st_size == 0:
+            return file_rows, file_counts, messages
+            
+        # Map the file and slice raw lines out of it - bytes are only decoded where needed
+        parse = None
+        with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for line_num, raw_line in enumerate(iter(mm.readline, b''), 1):
+                raw_line = raw_line.strip()
+                if not raw_line:
+                    continue
+                    
+                if parse is None:
+                    parse = _line_parser(raw_line, file_streamer, file_time_iso)
+                    
+                try:
+                    row = parse(raw_line)
+                except (json.JSONDecodeError, ValueError) as e:
+                    messages.append(f"    ⚠️ Parse error in {filename}:{line_num}: {e}")
+                    continue
+                    
+                if row is not None:
+                    file_rows.append(row)
+                    file_counts[(row[2], row[1])] += 1
+                    
+        return file_rows, file_counts, messages
+        
+    except Exception as e:
+        messages.append(f"    ❌ Error loading {file_path.name}: {e}")
+        return None, None, messages
+
 class TikTokDataAnalyzer:
     """Analyze scraped TikTok data and generate reports"""
     
     def __init__(self, data_dir: str = "output"):
         self.data_dir = Path(data_dir)
-        self.data = []
+        # Events are stored column-wise (one list per field) so scans touch only what they need
+        self.columns: Dict[str, List[Any]] = {column: [] for column in COLUMNS}
+        # Dictionary encoding for categorical columns: maps each distinct string to one shared object
+        self._category_pool: Dict[str, str] = {}
+        # Comment row indices plus original and lowercased content, built on first search
+        self._search_index: Optional[Tuple[List[int], List[str], List[str]]] = None
         self.stats = defaultdict(int)
         self.streamer_stats = defaultdict(lambda: defaultdict(int))
         
-    def load_data(self, days_back: int = 7):
-        """Load data from the last N days"""
+        # Pre-built stat keys for the known event types
+        self._stat_keys = {
+            event_type: f'{event_type}_events'
+            for event_type in ('comment', 'like', 'share', 'follow', 'system', 'unknown')
+        }
+        
+    @property
+    def event_count(self) -> int:
+        """Number of events loaded"""
+        return len(self.columns['event_type'])
+        
+    def _event_at(self, index: int) -> Dict[str, Any]:
+        """Rebuild a single event dict from the columns"""
+        event = {}
+        for field in EVENT_FIELDS:
+            value = self.columns[field][index]
+            if value is not None:
+                event[field] = value
+        return event
+        
+    def load_data(self, days_back: int = 7, workers: Optional[int] = None):
+        """Load data from the last N days, parsing files in parallel across worker processes"""
         print(f"📂 Loading data from {self.data_dir} (last {days_back} days)")
         
-        cutoff_date = datetime.now() - timedelta(days=days_back)
+        cutoff_ts = (datetime.now() - timedelta(days=days_back)).timestamp()
         files_loaded = 0
         
+        # Single directory pass; names are filtered before any stat call.
         # Look for both old format and new format files
-        patterns = ["tiktok-rawdata-*.txt", "tiktok-comments-*.txt"]
-        
-        for pattern in patterns:
-            for file_path in self.data_dir.glob(pattern):
-                try:
-                    # Check file modification time
-                    file_time = datetime.fromtimestamp(file_path.stat().st_mtime)
-                    if file_time < cutoff_date:
+        files = []
+        try:
+            with os.scandir(self.data_dir) as entries:
+                for entry in entries:
+                    if not (entry.name.startswith(DATA_FILE_PREFIXES) and entry.name.endswith('.txt')):
                         continue
-                        
-                    print(f"  📄 Loading {file_path.name}")
-                    
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        for line_num, line in enumerate(f, 1):
-                            line = line.strip()
-                            if not line:
-                                continue
-                                
-                            try:
-                                # Try to parse as JSON first (new format)
-                                if line.startswith('{'):
-                                    data = json.loads(line)
-                                    self.data.append(data)
-                                    
-                                    # Track basic stats
-                                    self.stats['total_events'] += 1
-                                    event_type = data.get('event_type', 'unknown')
-                                    self.stats[f'{event_type}_events'] += 1
-                                    
-                                    # Track per-streamer stats
-                                    streamer = data.get('streamer', 'unknown')
-                                    self.streamer_stats[streamer]['total_events'] += 1
-                                    self.streamer_stats[streamer][f'{event_type}_events'] += 1
-                                    
-                                else:
-                                    # Parse as text format - try both new and old formats
-                                    parts = line.split('|')
-                                    
-                                    if len(parts) == 2:
-                                        # New format: user|content (no timestamp)
-                                        user, content = parts
-                                        
-                                        # Extract streamer name from filename
-                                        filename = file_path.name
-                                        if 'tiktok-rawdata-' in filename:
-                                            streamer = filename.replace('tiktok-rawdata-', '').split('-')[0]
-                                        elif 'tiktok-comments-' in filename:
-                                            streamer = filename.replace('tiktok-comments-', '').split('-')[0]
-                                        else:
-                                            streamer = 'unknown'
-                                        
-                                        # Use file time as timestamp for new format
-                                        timestamp_str = file_time.isoformat()
-                                        
-                                    elif len(parts) == 3:
-                                        # Old format: timestamp|user|content
-                                        timestamp_str, user, content = parts
-                                        
-                                        # Extract streamer name from filename
-                                        filename = file_path.name
-                                        if 'tiktok-rawdata-' in filename:
-                                            streamer = filename.replace('tiktok-rawdata-', '').split('-')[0]
-                                        elif 'tiktok-comments-' in filename:
-                                            streamer = filename.replace('tiktok-comments-', '').split('-')[0]
-                                        else:
-                                            streamer = 'unknown'
-                                            
-                                    else:
-                                        # Skip malformed lines
-                                        continue
-                                    
-                                    # Determine event type based on content
-                                    event_type = 'comment'
-                                    if user == 'SYSTEM':
-                                        event_type = 'system'
-                                    elif content.startswith('❤️'):
-                                        event_type = 'like'
-                                    elif content.startswith('🔄'):
-                                        event_type = 'share'
-                                    elif content.startswith('➕'):
-                                        event_type = 'follow'
-                                    
-                                    # Create standardized data structure
-                                    data = {
-                                        'timestamp': timestamp_str,
-                                        'event_type': event_type,
-                                        'streamer': streamer,
-                                        'user': user,
-                                        'content': content
-                                    }
-                                    
-                                    self.data.append(data)
-                                    
-                                    # Track basic stats
-                                    self.stats['total_events'] += 1
-                                    self.stats[f'{event_type}_events'] += 1
-                                    
-                                    # Track per-streamer stats
-                                    self.streamer_stats[streamer]['total_events'] += 1
-                                    self.streamer_stats[streamer][f'{event_type}_events'] += 1
-                                        
-                            except (json.JSONDecodeError, ValueError) as e:
-                                print(f"    ⚠️ Parse error in {file_path.name}:{line_num}: {e}")
-                                
-                    files_loaded += 1
-                    
-                except Exception as e:
-                    print(f"    ❌ Error loading {file_path.name}: {e}")
+                    try:
+                        if not entry.is_file():
+                            continue
+                        # Check file modification time
+                        mtime = entry.stat().st_mtime
+                    except OSError as e:
+                        print(f"    ❌ Error loading {entry.name}: {e}")
+                        continue
+                    if mtime >= cutoff_ts:
+                        files.append((Path(entry.path), datetime.fromtimestamp(mtime)))
+        except FileNotFoundError:
+            pass  # no data directory yet - nothing to load (same as an empty directory)
+        except OSError as e:
+            print(f"    ❌ Error reading {self.data_dir}: {e}")
+        # scandir order is arbitrary; sort so reports and search results are reproducible
+        files.sort()
                     
-        print(f"✅ Loaded {len(self.data)} events from {files_loaded} files")
+        if workers is None:
+            workers = os.cpu_count() or 1
+        workers = min(workers, len(files))
         
-    def generate_report(self) -> str:
-        """Generate comprehensive analysis report"""
-        if not self.data:
+        if workers > 1:
+            # Several files per task amortizes the pickling round-trip; map() keeps file order
+            chunksize = max(1, len(files) // (workers * 4))
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = executor.map(_parse_file, *zip(*files), chunksize=chunksize)
+                for (file_path, _), result in zip(files, results):
+                    files_loaded += self._add_file_result(file_path, *result)
+        else:
+            for file_path, file_time in files:
+                files_loaded += self._add_file_result(file_path, *_parse_file(file_path, file_time))
+                
+        print(f"✅ Loaded {self.event_count} events from {files_loaded} files")
+        
+    def _add_file_result(self, file_path: Path, rows: Optional[List[tuple]], counts: Optional[Counter],
+                         messages: List[str]) -> bool:
+        """Append one parsed file to the columns and stats, returning whether it loaded"""
+        print(f"  📄 Loading {file_path.name}")
+        for message in messages:
+            print(message)
+        if rows is None:
+            return False
+            
+        for column, values in zip(COLUMNS, zip(*rows)):
+            if column in CATEGORICAL_COLUMNS:
+                values = self._pool_categories(column, values)
+            self.columns[column].extend(values)
+        self._search_index = None
+        self._merge_counts(counts)
+        return True
+        
+    def _pool_categories(self, column: str, values: tuple) -> Iterable[Any]:
+        """
+        Swap each string value for the pooled copy; anything else (e.g. a JSON object or
+        array from a malformed event) passes through unchanged. The user column is only
+        pooled when this file's users are low-cardinality.
+        """
+        if column == 'user':
+            distinct = {value for value in values if type(value) is str}
+            if len(distinct) >= USER_POOL_MAX_RATIO * len(values):
+                return values
+        pool = self._category_pool
+        return [pool.setdefault(value, value) if type(value) is str else value for value in values]
+        
+    def _merge_counts(self, counts: Counter):
+        """Fold per-(streamer, event_type) counts into the overall and per-streamer stats"""
+        for (streamer, event_type), count in counts.items():
+            key = self._stat_keys.get(event_type) or f'{event_type}_events'
+            
+            # Track basic stats
+            self.stats['total_events'] += count
+            self.stats[key] += count
+            
+            # Track per-streamer stats
+            streamer_stats = self.streamer_stats[streamer]
+            streamer_stats['total_events'] += count
+            streamer_stats[key] += count
+            
+    def generate_report(self, top_streamers: Optional[int] = None) -> str:
+        """Generate comprehensive analysis report, optionally listing only the top N streamers"""
+        if not self.event_count:
             return "❌ No data loaded. Run load_data() first."
             
+        event_types = self.columns['event_type']
+            
         report = []
         report.append("=" * 60)
         report.append("📊 TIKTOK SCRAPER DATA ANALYSIS REPORT")
@@ -160,13 +387,14 @@ class TikTokDataAnalyzer:
         report.append("")
         
         # Time range analysis
-        if self.data:
-            timestamps = [datetime.fromisoformat(event.get('timestamp', '')) 
-                         for event in self.data if event.get('timestamp')]
+        if self.event_count:
+            timestamps = [epoch for epoch in self.columns['ts_epoch'] if epoch is not None]
             if timestamps:
-                start_time = min(timestamps)
-                end_time = max(timestamps)
-                duration = end_time - start_time
+                start_epoch = min(timestamps)
+                end_epoch = max(timestamps)
+                start_time = datetime.fromtimestamp(start_epoch)
+                end_time = datetime.fromtimestamp(end_epoch)
+                duration = timedelta(seconds=end_epoch - start_epoch)
                 
                 report.append("⏰ TIME RANGE")
                 report.append("-" * 30)
@@ -176,26 +404,40 @@ class TikTokDataAnalyzer:
                 
                 # Events per hour
                 if duration.total_seconds() > 0:
-                    events_per_hour = len(self.data) / (duration.total_seconds() / 3600)
+                    events_per_hour = self.event_count / (duration.total_seconds() / 3600)
                     report.append(f"  Events per hour: {events_per_hour:.1f}")
                 report.append("")
         
         # Streamer statistics
         report.append("👥 STREAMER STATISTICS")
         report.append("-" * 30)
-        for streamer, stats in sorted(self.streamer_stats.items(), 
-                                    key=lambda x: x[1]['total_events'], reverse=True):
+        # Flat totals list keeps the sort key a plain index lookup
+        streamers = list(self.streamer_stats)
+        totals = [self.streamer_stats[streamer]['total_events'] for streamer in streamers]
+        if top_streamers is None:
+            order = sorted(range(len(streamers)), key=totals.__getitem__, reverse=True)
+        else:
+            # O(N log K) partial selection when only the top K are shown
+            order = heapq.nlargest(top_streamers, range(len(streamers)), key=totals.__getitem__)
+            
+        for position in order:
+            streamer = streamers[position]
+            stats = self.streamer_stats[streamer]
             report.append(f"  📺 {streamer}:")
             for event_type, count in sorted(stats.items()):
                 if event_type != 'total_events':
                     report.append(f"    {event_type.replace('_', ' ').title()}: {count:,}")
             report.append("")
             
+        if len(order) < len(streamers):
+            report.append(f"  ... and {len(streamers) - len(order)} more streamers")
+            report.append("")
+            
         # Top commenters
         commenters = Counter()
-        for event in self.data:
-            if event.get('event_type') == 'comment':
-                commenters[event.get('user', 'unknown')] += 1
+        for event_type, user in zip(event_types, self.columns['user']):
+            if event_type == 'comment':
+                commenters['unknown' if user is None else user] += 1
                 
         if commenters:
             report.append("💬 TOP COMMENTERS")
@@ -205,67 +447,68 @@ class TikTokDataAnalyzer:
             report.append("")
             
         # Comment analysis
-        comments = [event.get('content', '') for event in self.data 
-                   if event.get('event_type') == 'comment']
+        comments = [content or '' for event_type, content in zip(event_types, self.columns['content'])
+                   if event_type == 'comment']
         
         if comments:
             report.append("📝 COMMENT ANALYSIS")
             report.append("-" * 30)
             
-            # Language detection (basic)
-            arabic_comments = sum(1 for comment in comments if self._contains_arabic(comment))
-            english_comments = sum(1 for comment in comments if self._contains_english(comment))
+            # Language detection (basic), total length and word counts in one pass
+            arabic_comments = 0
+            english_comments = 0
+            total_length = 0
+            word_counter = Counter()
+            for comment in comments:
+                if self._contains_arabic(comment):
+                    arabic_comments += 1
+                if self._contains_english(comment):
+                    english_comments += 1
+                total_length += len(comment)
+                
+                # Simple word extraction (Counter.update counts the list in C)
+                word_counter.update(WORD_RE.findall(comment.lower()))
             
             report.append(f"  Total comments: {len(comments):,}")
             report.append(f"  Arabic comments: {arabic_comments:,} ({arabic_comments/len(comments)*100:.1f}%)")
             report.append(f"  English comments: {english_comments:,} ({english_comments/len(comments)*100:.1f}%)")
             
             # Average comment length
-            avg_length = sum(len(comment) for comment in comments) / len(comments)
+            avg_length = total_length / len(comments)
             report.append(f"  Average length: {avg_length:.1f} characters")
             
-            # Most common words (basic analysis)
-            all_words = []
-            for comment in comments:
-                # Simple word extraction
-                words = re.findall(r'\b\w+\b', comment.lower())
-                all_words.extend(words)
-                
-            if all_words:
-                word_counter = Counter(all_words)
-                # Filter out very short words and numbers
-                filtered_words = {word: count for word, count in word_counter.items() 
-                                if len(word) > 2 and not word.isdigit()}
-                
+            # Most common words (basic analysis) - short words and numbers are filtered
+            # once per unique word while selecting the top 10, not per occurrence
+            top_words = heapq.nlargest(
+                10,
+                ((word, count) for word, count in word_counter.items()
+                 if len(word) > 2 and not word.isdigit()),
+                key=itemgetter(1)
+            )
+            if top_words:
                 report.append("  Most common words:")
-                for word, count in Counter(filtered_words).most_common(10):
+                for word, count in top_words:
                     report.append(f"    '{word}': {count:,}")
             report.append("")
             
         # Activity patterns
-        if self.data:
+        if self.event_count:
             report.append("📅 ACTIVITY PATTERNS")
             report.append("-" * 30)
             
-            # Activity by hour
-            hourly_activity = defaultdict(int)
-            daily_activity = defaultdict(int)
-            
-            for event in self.data:
-                timestamp_str = event.get('timestamp')
-                if timestamp_str:
-                    try:
-                        dt = datetime.fromisoformat(timestamp_str)
-                        hourly_activity[dt.hour] += 1
-                        daily_activity[dt.strftime('%Y-%m-%d')] += 1
-                    except:
-                        continue
+            # Activity by hour/day - hour and day were cached at load time, and
+            # Counter over a whole column counts in C; None marks events without a timestamp
+            hourly_activity = Counter(self.columns['ts_hour'])
+            daily_activity = Counter(self.columns['ts_day'])
+            hourly_activity.pop(None, None)
+            daily_activity.pop(None, None)
                         
             if hourly_activity:
                 report.append("  Activity by hour:")
+                bar_scale = max(1, max(hourly_activity.values()) // 50)
                 for hour in sorted(hourly_activity.keys()):
                     count = hourly_activity[hour]
-                    bar = "█" * min(50, count // max(1, max(hourly_activity.values()) // 50))
+                    bar = "█" * min(50, count // bar_scale)
                     report.append(f"    {hour:2d}:00 {count:4d} {bar}")
                 report.append("")
                 
@@ -281,41 +524,95 @@ class TikTokDataAnalyzer:
         
     def _contains_arabic(self, text: str) -> bool:
         """Check if text contains Arabic characters"""
-        arabic_pattern = re.compile(r'[\u0600-\u06FF\u0750-\u077F\u08A0-\u08FF\uFB50-\uFDFF\uFE70-\uFEFF]')
-        return bool(arabic_pattern.search(text))
+        # isascii() is a flag check in CPython, so pure-ASCII text skips the scan
+        return not text.isascii() and ARABIC_RE.search(text) is not None
         
     def _contains_english(self, text: str) -> bool:
         """Check if text contains English characters"""
-        english_pattern = re.compile(r'[a-zA-Z]')
-        return bool(english_pattern.search(text))
+        return ENGLISH_RE.search(text) is not None
         
     def export_summary(self, output_file: str):
-        """Export summary to JSON file"""
+        """
+        Export summary to a JSON file. A '.jsonl' name writes NDJSON (a header line, then one
+        line per streamer) so large summaries can be stream-parsed; a '.gz' suffix compresses.
+        """
         summary = {
             'generated_at': datetime.now().isoformat(),
-            'total_events': len(self.data),
-            'stats': dict(self.stats),
-            'streamer_stats': {k: dict(v) for k, v in self.streamer_stats.items()}
+            'total_events': self.event_count,
+            'stats': dict(self.stats)
         }
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(summary, f, indent=2, ensure_ascii=False)
+        if output_file.removesuffix('.gz').endswith('.jsonl'):
+            payload = b''.join(
+                [_json_dumps(summary)]
+                + [_json_dumps({'streamer': k, **v}) for k, v in self.streamer_stats.items()]
+            )
+        else:
+            summary['streamer_stats'] = {k: dict(v) for k, v in self.streamer_stats.items()}
+            payload = _json_dumps(summary, indent=True)
+            
+        if output_file.endswith('.gz'):
+            # Fastest level: summaries compress well even at level 1
+            with gzip.open(output_file, 'wb', compresslevel=1) as f:
+                f.write(payload)
+        else:
+            with open(output_file, 'wb') as f:
+                f.write(payload)
             
         print(f"📊 Summary exported to {output_file}")
         
+    def _get_search_index(self) -> Tuple[List[int], List[str], List[str]]:
+        """Comment row indices with their content, lowercased once and reused across searches"""
+        if self._search_index is None:
+            indices = []
+            contents = []
+            for index, (event_type, content) in enumerate(zip(self.columns['event_type'], self.columns['content'])):
+                if event_type == 'comment':
+                    indices.append(index)
+                    contents.append(content or '')
+            self._search_index = (indices, contents, [content.lower() for content in contents])
+        return self._search_index
+        
     def search_comments(self, query: str, case_sensitive: bool = False) -> List[Dict]:
         """Search for specific comments"""
-        results = []
+        indices, contents, contents_lower = self._get_search_index()
         query_lower = query.lower() if not case_sensitive else query
+        search_contents = contents if case_sensitive else contents_lower
         
-        for event in self.data:
-            if event.get('event_type') == 'comment':
-                content = event.get('content', '')
-                search_content = content if case_sensitive else content.lower()
+        return [
+            self._event_at(index)
+            for index, search_content in zip(indices, search_contents)
+            if query_lower in search_content
+        ]
+        
+    def search_comments_multi(self, queries: List[str], case_sensitive: bool = False) -> Dict[str, List[Dict]]:
+        """Search for several queries at once, returning matches per query"""
+        if len(queries) == 1 or not AHOCORASICK_AVAILABLE or not all(queries):
+            return {query: self.search_comments(query, case_sensitive) for query in queries}
+            
+        indices, contents, contents_lower = self._get_search_index()
+        search_contents = contents if case_sensitive else contents_lower
+        
+        # One automaton scans each comment once for every query. Queries that normalize to the
+        # same key (e.g. 'Foo' and 'foo' case-insensitively) share one entry listing all of them.
+        queries_by_key: Dict[str, List[str]] = {}
+        for query in queries:
+            key = query if case_sensitive else query.lower()
+            key_queries = queries_by_key.setdefault(key, [])
+            if query not in key_queries:
+                key_queries.append(query)
+                
+        automaton = ahocorasick.Automaton()
+        for key, key_queries in queries_by_key.items():
+            automaton.add_word(key, key_queries)
+        automaton.make_automaton()
+        
+        results: Dict[str, List[Dict]] = {query: [] for query in queries}
+        for index, search_content in zip(indices, search_contents):
+            matched = {query for _, key_queries in automaton.iter(search_content) for query in key_queries}
+            for query in matched:
+                results[query].append(self._event_at(index))
                 
-                if query_lower in search_content:
-                    results.append(event)
-                    
         return results
 
 def main():
@@ -325,8 +622,14 @@ def main():
                         help="Directory containing scraped data")
     parser.add_argument("--days", type=int, default=7,
                         help="Number of days back to analyze")
-    parser.add_argument("--export", help="Export summary to JSON file")
-    parser.add_argument("--search", help="Search for specific comments")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes for loading files (default: CPU count)")
+    parser.add_argument("--top-streamers", type=int, default=None,
+                        help="Only list the N most active streamers in the report")
+    parser.add_argument("--export",
+                        help="Export summary to JSON file (.jsonl for per-streamer lines, .gz to compress)")
+    parser.add_argument("--search", action="append",
+                        help="Search for specific comments (repeat to search several terms at once)")
     parser.add_argument("--case-sensitive", action="store_true",
                         help="Case-sensitive search")
     
@@ -336,27 +639,28 @@ def main():
     analyzer = TikTokDataAnalyzer(args.data_dir)
     
     # Load data
-    analyzer.load_data(args.days)
+    analyzer.load_data(args.days, args.workers)
     
     if args.search:
         # Search functionality
-        results = analyzer.search_comments(args.search, args.case_sensitive)
-        print(f"\n🔍 Search results for '{args.search}' ({len(results)} found):")
-        print("-" * 50)
-        
-        for i, result in enumerate(results[:20], 1):  # Show first 20
-            timestamp = result.get('timestamp', 'unknown')
-            user = result.get('user', 'unknown')
-            content = result.get('content', '')
-            streamer = result.get('streamer', 'unknown')
-            
-            print(f"{i:2d}. [{timestamp}] @{streamer} - {user}: {content}")
+        results_by_query = analyzer.search_comments_multi(args.search, args.case_sensitive)
+        for query, results in results_by_query.items():
+            print(f"\n🔍 Search results for '{query}' ({len(results)} found):")
+            print("-" * 50)
             
-        if len(results) > 20:
-            print(f"... and {len(results) - 20} more results")
+            for i, result in enumerate(results[:20], 1):  # Show first 20
+                timestamp = result.get('timestamp', 'unknown')
+                user = result.get('user', 'unknown')
+                content = result.get('content', '')
+                streamer = result.get('streamer', 'unknown')
+                
+                print(f"{i:2d}. [{timestamp}] @{streamer} - {user}: {content}")
+                
+            if len(results) > 20:
+                print(f"... and {len(results) - 20} more results")
     else:
         # Generate and display report
-        report = analyzer.generate_report()
+        report = analyzer.generate_report(args.top_streamers)
         print(report)
         
     # Export if requested
@@ -6,21 +6,27 @@ Monitors multiple TikTok streamers and captures live comments with advanced feat
 """
 
 import asyncio
+import atexit
 import logging
+import logging.handlers
 import os
-import hashlib
+import queue
 import time
 import json
 import random
 import signal
 import sys
+import tempfile
 import unicodedata
 import re
+import heapq
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Set, Optional, Any
-from dataclasses import dataclass, asdict
-import traceback
+from types import SimpleNamespace
+from typing import Deque, Dict, List, Set, Optional, Any, Tuple
+from collections import defaultdict, deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
 
 # TikTokLive imports
 try:
@@ -31,6 +37,71 @@ except ImportError as e:
     print(f"Warning: TikTokLive not available: {e}")
     TIKTOK_LIVE_AVAILABLE = False
 
+# Optional fast JSON serializer
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Optional libuv-based event loop (not available on Windows)
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
+# Async file I/O for the session writers
+try:
+    import aiofiles
+    AIOFILES_AVAILABLE = True
+except ImportError as e:
+    print(f"Warning: aiofiles not available: {e}")
+    AIOFILES_AVAILABLE = False
+
+# Whitespace plus emoji/symbol ranges - a message made only of these is emoji-only
+EMOJI_AND_WS_RE = re.compile(
+    r'[\s'
+    r'\U0001F600-\U0001F64F'  # emoticons
+    r'\U0001F300-\U0001F5FF'  # symbols & pictographs
+    r'\U0001F680-\U0001F6FF'  # transport & map symbols
+    r'\U0001F1E0-\U0001F1FF'  # flags (iOS)
+    r'\U00002702-\U000027B0'  # dingbats
+    r'\U000024C2-\U0001F251'  # enclosed characters
+    r'\U0001F900-\U0001F9FF'  # supplemental symbols
+    r'\U0001FA70-\U0001FAFF'  # symbols and pictographs extended-a
+    r']'
+)
+
+# Session file line cleaning: newlines become spaces, pipes are removed (single translate pass)
+CONTENT_CLEAN_TABLE = str.maketrans({'\n': ' ', '\r': ' ', '|': ''})
+
+# Connection error messages that indicate TikTok rate limiting
+RATE_LIMIT_RE = re.compile(
+    r'rate[_ ]limit|too many requests|429|sign server|euler|blocked',
+    re.IGNORECASE
+)
+
+# Dedup entries are bucketed by hour of their timestamp
+DEDUP_BUCKET_SECONDS = 3600
+
+# Separator used to flatten (commenter, comment) dedup keys for JSON persistence
+HISTORY_KEY_SEP = '\x1f'
+
+# Commenter placeholder for comment events without a resolvable user
+UNKNOWN_COMMENTER = 'unknown'
+
+# TikTok usernames: 1-24 chars, letters, numbers, underscores, periods
+USERNAME_RE = re.compile(r'^[a-zA-Z0-9_.]{1,24}\Z')
+
+def _nfc(text: str) -> str:
+    """NFC-normalize text, skipping the call for pure ASCII (already NFC)"""
+    return text if text.isascii() else unicodedata.normalize('NFC', text)
+
+# Process umask, read once at import (os.umask can only be read by setting it)
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
 @dataclass
 class ScrapingStats:
     """Statistics tracking for the scraper"""
@@ -44,16 +115,15 @@ class ScrapingStats:
     rate_limit_hits: int = 0
     connection_attempts: int = 0
     failed_connections: int = 0
-    start_time: Optional[datetime] = None
-    last_update: Optional[datetime] = None
+    # Epoch seconds (time.time()), 0.0 until set - converted to ISO strings only on serialization
+    start_time: float = 0.0
+    last_update: float = 0.0
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization"""
-        result = asdict(self)
-        if self.start_time:
-            result['start_time'] = self.start_time.isoformat()
-        if self.last_update:
-            result['last_update'] = self.last_update.isoformat()
+        result = self.__dict__.copy()  # flat fields only - no need for asdict's recursive copy
+        result['start_time'] = datetime.fromtimestamp(self.start_time).isoformat() if self.start_time else None
+        result['last_update'] = datetime.fromtimestamp(self.last_update).isoformat() if self.last_update else None
         return result
 
 @dataclass 
@@ -71,6 +141,18 @@ class RateLimitConfig:
     retry_attempts: int = 3
     backoff_multiplier: float = 2.0
     jitter_range: tuple = (0.8, 1.2)
+    stats_flush_interval: int = 30
+    startup_jitter: float = 2.0
+    session_flush_interval: float = 1.0
+
+@dataclass
+class _StreamerState:
+    """Per-streamer connection and rate limit state"""
+    rate_limit_until: float = 0.0
+    last_conn: float = 0.0
+    active: bool = False
+    consecutive_failures: int = 0
+    consecutive_rate_limits: int = 0
 
 class EnhancedTikTokScraper:
     """
@@ -100,27 +182,63 @@ class EnhancedTikTokScraper:
         
         # Initialize state
         self.stats = ScrapingStats()
+        # Monotonic start time for runtime reporting (stats.start_time is wall clock, for display)
+        self._t0: Optional[float] = None
+        # Set when stats change; _stats_flusher writes them at most every stats_flush_interval
+        # (this and the other asyncio primitives are created in run(), see _create_loop_primitives)
+        self._stats_dirty: Optional[asyncio.Event] = None
+        self._last_saved_stats: Optional[Dict[str, Any]] = None
         self.active_clients: Dict[str, TikTokLiveClient] = {}
-        self.active_sessions: Set[str] = set()
+        # Connection/rate limit state per streamer (one lookup instead of several); bounded by
+        # the streamer list and never evicted, since it carries each monitor's backoff counters
+        self.streamers: Dict[str, _StreamerState] = {}
         self.session_files: Dict[str, Path] = {}
+        # Which user attribute holds the commenter name, resolved on the first comment per streamer
+        self._event_user_field: Dict[str, str] = {}
         
-        # Enhanced deduplication with persistent storage
-        self.recent_comments: Dict[str, Dict[str, float]] = {}
+        # Batched session file writers: one queue + background task per streamer
+        self._write_queues: Dict[str, asyncio.Queue] = {}
+        self._writer_tasks: Dict[str, asyncio.Task] = {}
+        # Writers already told to close but not finished yet - _close_writers waits for these too
+        self._closing_writers: Set[asyncio.Task] = set()
+        
+        # Enhanced deduplication with persistent storage: per streamer, hour bucket ->
+        # {(commenter, comment): timestamp}, so expiry drops whole buckets
+        # (history is loaded off the event loop at the start of run())
+        self.recent_comments: Dict[str, Dict[int, Dict[Tuple[str, str], float]]] = {}
+        # Per-streamer, per-commenter ring buffer of recent accepted comment times (rapid-fire detection)
+        self._recent_by_user: Dict[str, Dict[str, Deque[float]]] = defaultdict(
+            lambda: defaultdict(lambda: deque(maxlen=8))
+        )
+        # Reused scratch list for collecting keys to evict during cleanup
+        self._scratch_keys: list = []
         self.comment_history_file = self.output_dir / "comment_history.json"
-        self._load_comment_history()
+        # Set when a new entry is recorded, so idle status ticks skip the history rewrite
+        self._history_dirty = False
         
         # Rate limiting
         self.global_rate_limit_until = 0
-        self.streamer_rate_limits: Dict[str, float] = {}
-        self.connection_semaphore = asyncio.Semaphore(self.config.max_concurrent_connections)
+        # Admission control: counter + condition, so the limit can shrink/grow at runtime
+        self._conc_lock: Optional[asyncio.Lock] = None
+        self._conc_cond: Optional[asyncio.Condition] = None
+        self._conc_active = 0
+        self._conc_max = self.config.max_concurrent_connections
         self.last_connection_time = 0
         
         # Graceful shutdown
         self.running = True
-        self._setup_signal_handlers()
+        # Set by SIGINT/SIGTERM (handlers are installed on the loop in run())
+        self._shutdown_evt: Optional[asyncio.Event] = None
         
         self.logger.info("Enhanced TikTok Scraper initialized")
         
+    def _streamer_state(self, username: str) -> _StreamerState:
+        """Get (or create) the state record for a streamer"""
+        st = self.streamers.get(username)
+        if st is None:
+            st = self.streamers[username] = _StreamerState()
+        return st
+        
     def _resolve_path(self, path_str: str) -> Path:
         """Resolve path relative to script directory"""
         path = Path(path_str)
@@ -146,84 +264,151 @@ class EnhancedTikTokScraper:
     def _save_config(self, config: RateLimitConfig):
         """Save configuration to file"""
         try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(asdict(config), f, indent=2)
+            self._atomic_write(self.config_file, json.dumps(vars(config), indent=2).encode('utf-8'))
         except Exception as e:
             print(f"Error saving config: {e}")
             
+    def _atomic_write(self, path: Path, data: bytes):
+        """Write to a temp file in the same directory, then rename over the target"""
+        # Unique temp file per write, so concurrent writers (threads or processes) never share one
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f"{path.name}.", suffix='.tmp')
+        tmp_path = Path(tmp_name)
+        try:
+            # One pre-encoded buffer, written with raw os.write calls and synced before the rename
+            try:
+                # mkstemp creates the file 0600; give it the mode open() would (0666 minus the umask)
+                if hasattr(os, 'fchmod'):
+                    os.fchmod(fd, 0o666 & ~_UMASK)
+                view = memoryview(data)
+                while view:
+                    view = view[os.write(fd, view):]
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+            os.replace(tmp_path, path)
+        except BaseException:
+            # Don't leave a partial temp file behind
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+            raise
+            
+        # Persist the rename itself (directories can't be opened for fsync on Windows)
+        if hasattr(os, 'O_DIRECTORY'):
+            dir_fd = os.open(path.parent, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+        
+    def _write_json(self, path: Path, obj: Any, indent: bool = False):
+        """Encode obj as JSON and write it atomically (blocking - run via asyncio.to_thread)"""
+        if ORJSON_AVAILABLE:
+            data = orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+        elif indent:
+            data = json.dumps(obj, indent=2).encode('utf-8')
+        else:
+            data = json.dumps(obj, separators=(',', ':')).encode('utf-8')
+        self._atomic_write(path, data)
+            
     def _setup_logging(self):
         """Setup comprehensive logging"""
         log_file = self.output_dir / f"scraper_{datetime.now().strftime('%Y%m%d')}.log"
         
-        # Create formatter
-        formatter = logging.Formatter(
+        # Detailed formatter for the log file (with call site), terse one for the console
+        file_formatter = logging.Formatter(
             '%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s'
         )
+        console_formatter = logging.Formatter('%(asctime)s %(levelname)s %(message)s')
         
         # Setup file handler
         file_handler = logging.FileHandler(log_file, encoding='utf-8')
         file_handler.setLevel(logging.DEBUG)
-        file_handler.setFormatter(formatter)
+        file_handler.setFormatter(file_formatter)
         
-        # Setup console handler
+        # Setup console handler - replace characters the terminal can't encode
+        if hasattr(sys.stdout, 'reconfigure'):
+            sys.stdout.reconfigure(errors='replace')
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setLevel(logging.INFO)
-        console_handler.setFormatter(formatter)
+        console_handler.setFormatter(console_formatter)
+        
+        # Records are queued by the logger and written by a background listener thread,
+        # so file/console I/O stays off the event loop
+        self._log_queue = queue.SimpleQueue()
+        self._log_listener = logging.handlers.QueueListener(
+            self._log_queue, file_handler, console_handler, respect_handler_level=True
+        )
+        self._log_listener.start()
+        atexit.register(self._stop_logging)
         
         # Setup logger
         self.logger = logging.getLogger(__name__)
         self.logger.setLevel(logging.DEBUG)
-        self.logger.addHandler(file_handler)
-        self.logger.addHandler(console_handler)
+        self._queue_handler = logging.handlers.QueueHandler(self._log_queue)
+        self.logger.addHandler(self._queue_handler)
         
         # Prevent duplicate logs
         self.logger.propagate = False
         
+    def _stop_logging(self):
+        """Drain queued log records, stop the listener thread and close the handlers (safe to call more than once)"""
+        listener, self._log_listener = self._log_listener, None
+        if listener is not None:
+            self.logger.removeHandler(self._queue_handler)
+            listener.stop()
+            for handler in listener.handlers:
+                handler.close()
+        
     def _is_emoji_only_message(self, text: str) -> bool:
         """Check if the message contains only emojis and whitespace"""
-        if not text or not text.strip():
+        if not text:
             return True
             
-        # Remove all whitespace
-        text_no_space = text.replace(' ', '').replace('\n', '').replace('\r', '').replace('\t', '')
-        
-        # If empty after removing whitespace, it's not useful
-        if not text_no_space:
-            return True
-            
-        # Check if all characters are emojis/symbols
-        emoji_pattern = re.compile(
-            r'[\U0001F600-\U0001F64F]|'  # emoticons
-            r'[\U0001F300-\U0001F5FF]|'  # symbols & pictographs
-            r'[\U0001F680-\U0001F6FF]|'  # transport & map symbols
-            r'[\U0001F1E0-\U0001F1FF]|'  # flags (iOS)
-            r'[\U00002702-\U000027B0]|'  # dingbats
-            r'[\U000024C2-\U0001F251]|'  # enclosed characters
-            r'[\U0001F900-\U0001F9FF]|'  # supplemental symbols
-            r'[\U0001FA70-\U0001FAFF]'   # symbols and pictographs extended-a
-        )
-        
-        # Remove all emojis from the text
-        text_no_emoji = emoji_pattern.sub('', text_no_space)
-        
-        # If nothing remains after removing emojis, it's emoji-only
-        return len(text_no_emoji.strip()) == 0
+        # Strip whitespace and emojis in one pass - if nothing remains, it's emoji-only
+        return not EMOJI_AND_WS_RE.sub('', text)
         
     def _setup_signal_handlers(self):
-        """Setup graceful shutdown signal handlers"""
-        def signal_handler(signum, frame):
-            self.logger.info(f"Received signal {signum}, initiating graceful shutdown...")
-            self.running = False
-            
-        signal.signal(signal.SIGINT, signal_handler)
-        signal.signal(signal.SIGTERM, signal_handler)
+        """Setup graceful shutdown signal handlers on the running event loop"""
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(signum, self._initiate_shutdown, signum)
+            except (NotImplementedError, RuntimeError):
+                # No loop signal support (e.g. Windows) - plain handler that hands off to the loop
+                signal.signal(signum, lambda sig, frame: loop.call_soon_threadsafe(self._initiate_shutdown, sig))
+                
+    def _create_loop_primitives(self):
+        """
+        Create the asyncio primitives on the running loop - on Python 3.9 they bind to the
+        loop current at construction, which isn't the one asyncio.run() starts
+        """
+        self._stats_dirty = asyncio.Event()
+        self._conc_lock = asyncio.Lock()
+        self._conc_cond = asyncio.Condition(self._conc_lock)
+        self._shutdown_evt = asyncio.Event()
+        
+    def _initiate_shutdown(self, signum: int):
+        """Stop the monitors and wake run() so it can clean up"""
+        self.logger.info(f"Received signal {signum}, initiating graceful shutdown...")
+        self.running = False
+        self._shutdown_evt.set()
         
-    def _load_comment_history(self):
-        """Load comment history for persistent deduplication"""
+    def _load_comment_history_sync(self):
+        """Load comment history for persistent deduplication (blocking - run via asyncio.to_thread)"""
         if self.comment_history_file.exists():
             try:
-                with open(self.comment_history_file, 'r', encoding='utf-8') as f:
-                    self.recent_comments = json.load(f)
+                data = self.comment_history_file.read_bytes()
+                history = orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+                # Keys are stored as "commenter<SEP>comment"; entries in any other format are dropped
+                self.recent_comments = {}
+                for username, comments in history.items():
+                    buckets = self.recent_comments[username] = {}
+                    for key, timestamp in comments.items():
+                        if HISTORY_KEY_SEP in key:
+                            bucket = int(timestamp // DEDUP_BUCKET_SECONDS)
+                            buckets.setdefault(bucket, {})[tuple(key.split(HISTORY_KEY_SEP, 1))] = timestamp
                 self.logger.info("Loaded comment history for deduplication")
             except Exception as e:
                 self.logger.warning(f"Error loading comment history: {e}")
@@ -231,25 +416,38 @@ class EnhancedTikTokScraper:
         else:
             self.recent_comments = {}
             
-    def _save_comment_history(self):
+    async def _save_comment_history(self):
         """Save comment history for persistent deduplication"""
+        if not self._history_dirty:
+            return
+            
         try:
-            # Clean old entries before saving
-            current_time = time.time()
-            cutoff_time = current_time - (24 * 3600)  # Keep 24 hours
+            # Drop hour buckets older than 24 hours in place before saving
+            cutoff_bucket = int(time.time() // DEDUP_BUCKET_SECONDS) - 24
             
-            cleaned_history = {}
-            for username, comments in self.recent_comments.items():
-                cleaned_comments = {
-                    hash_val: timestamp for hash_val, timestamp in comments.items()
-                    if timestamp > cutoff_time
-                }
-                if cleaned_comments:
-                    cleaned_history[username] = cleaned_comments
+            for username in list(self.recent_comments):
+                buckets = self.recent_comments[username]
+                for hour in list(buckets):
+                    if hour < cutoff_bucket or not buckets[hour]:
+                        del buckets[hour]
+                if not buckets:
+                    del self.recent_comments[username]
                     
-            with open(self.comment_history_file, 'w', encoding='utf-8') as f:
-                json.dump(cleaned_history, f, indent=2)
+            # Snapshot on the loop thread: buckets are merged and tuple keys flattened for JSON
+            history = {
+                username: {
+                    HISTORY_KEY_SEP.join(key): timestamp
+                    for hour in sorted(buckets)
+                    for key, timestamp in buckets[hour].items()
+                }
+                for username, buckets in self.recent_comments.items()
+            }
+            self._history_dirty = False
+            
+            # Encode (compact, no pretty-printing) and write in a worker thread
+            await asyncio.to_thread(self._write_json, self.comment_history_file, history)
         except Exception as e:
+            self._history_dirty = True
             self.logger.error(f"Error saving comment history: {e}")
             
     def load_streamers(self) -> List[str]:
@@ -282,10 +480,7 @@ class EnhancedTikTokScraper:
         """Validate TikTok username format"""
         if not username:
             return False
-        # TikTok usernames: 1-24 chars, letters, numbers, underscores, periods
-        import re
-        pattern = r'^[a-zA-Z0-9_.]{1,24}$'
-        return bool(re.match(pattern, username))
+        return USERNAME_RE.match(username) is not None
         
     def _create_streamers_template(self):
         """Create template streamers file"""
@@ -312,8 +507,8 @@ class EnhancedTikTokScraper:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         return f"tiktok-rawdata-{username}-{timestamp}.txt"
         
-    async def save_event(self, username: str, event_type: str, commenter: str, content: str, extra_data: Dict = None):
-        """Save comment events in simple text format - only comment text, no usernames"""
+    async def save_event(self, username: str, event_type: str, content: str, commenter: str = ""):
+        """Save comment events in simple text format - only comment text, no usernames (commenter is used for dedup only)"""
         try:
             current_time = time.time()
             
@@ -328,89 +523,171 @@ class EnhancedTikTokScraper:
                     self.stats.duplicates_filtered += 1  # Count as filtered
                     return
                     
-            # Create session file if needed
+            # Create session file and its writer if needed
             if username not in self.session_files:
                 filename = self.get_output_filename(username)
                 filepath = self.output_dir / filename
                 self.session_files[username] = filepath
                 
+                queue = asyncio.Queue()
+                self._write_queues[username] = queue
+                self._writer_tasks[username] = asyncio.create_task(self._writer_loop(username, filepath, queue))
+                
                 # Write session header in text format
-                with open(filepath, 'w', encoding='utf-8') as f:
-                    f.write(f"SYSTEM: Connected to @{username}'s live stream\n")
+                queue.put_nowait(f"SYSTEM: Connected to @{username}'s live stream\n")
                     
             # Clean content for text format (remove pipes and newlines)
-            clean_content = str(content).replace('\n', ' ').replace('\r', ' ').strip()
+            clean_content = str(content).translate(CONTENT_CLEAN_TABLE).strip()
             
             # Only save comments and system messages - skip other event types
             if event_type == 'comment':
                 # Save only the comment text (no username)
-                filepath = self.session_files[username]
-                with open(filepath, 'a', encoding='utf-8') as f:
-                    f.write(f"{clean_content}\n")
-                    f.flush()
+                await self._write_queues[username].put(f"{clean_content}\n")
                 
                 # Update stats
                 self.stats.comments_captured += 1
-                self.stats.last_update = datetime.now()
+                self.stats.last_update = current_time
+                self._stats_dirty.set()
                 
-                # Log with proper Unicode handling
-                display_content = content[:100] + '...' if len(content) > 100 else content
-                try:
-                    self.logger.info(f"[{username}] COMMENT: {display_content}")
-                except UnicodeEncodeError:
-                    safe_content = content.encode('ascii', errors='replace').decode('ascii')
-                    self.logger.info(f"[{username}] COMMENT: {safe_content}")
+                # Per-comment logging is debug-only (file log)
+                if self.logger.isEnabledFor(logging.DEBUG):
+                    display_content = content[:100] + '...' if len(content) > 100 else content
+                    self.logger.debug(f"[{username}] COMMENT: {display_content}")
                     
             elif event_type == 'system':
                 # Keep system messages with SYSTEM prefix for connection tracking
-                filepath = self.session_files[username]
-                with open(filepath, 'a', encoding='utf-8') as f:
-                    f.write(f"SYSTEM: {clean_content}\n")
-                    f.flush()
+                await self._write_queues[username].put(f"SYSTEM: {clean_content}\n")
                 
         except Exception as e:
             self.logger.error(f"Error saving {event_type} for {username}: {e}")
             
+    async def _writer_loop(self, username: str, filepath: Path, queue: asyncio.Queue):
+        """
+        Write queued lines to a session file, keeping it open for the whole session.
+        Everything queued since the last write goes out in one batch; the file is flushed
+        every 64 lines or at most session_flush_interval seconds after the first unflushed
+        line. A None item flushes, closes the file and stops.
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            async with aiofiles.open(filepath, 'a', encoding='utf-8') as f:
+                unflushed = 0
+                flush_deadline = None
+                while True:
+                    # Wait for more lines, but no longer than the pending flush deadline
+                    timeout = None if flush_deadline is None else max(0.0, flush_deadline - loop.time())
+                    try:
+                        line = await asyncio.wait_for(queue.get(), timeout=timeout)
+                    except asyncio.TimeoutError:
+                        await f.flush()
+                        unflushed = 0
+                        flush_deadline = None
+                        continue
+                        
+                    # Drain whatever else is already queued into the same write
+                    batch = []
+                    while line is not None:
+                        batch.append(line)
+                        if queue.empty():
+                            break
+                        line = queue.get_nowait()
+                        
+                    if batch:
+                        await f.write(''.join(batch))
+                        unflushed += len(batch)
+                        if flush_deadline is None:
+                            flush_deadline = loop.time() + self.config.session_flush_interval
+                        
+                    if line is None:
+                        break
+                        
+                    if unflushed >= 64 or loop.time() >= flush_deadline:
+                        await f.flush()
+                        unflushed = 0
+                        flush_deadline = None
+        except Exception as e:
+            self.logger.error(f"Error writing session file for @{username}: {e}")
+            # Unregister this writer (unless already replaced) so save_event stops queueing
+            # into a queue nobody drains, and the next event reopens a session file
+            if self._write_queues.get(username) is queue:
+                del self._write_queues[username]
+                self._writer_tasks.pop(username, None)
+                self.session_files.pop(username, None)
+            
+    async def _close_writer(self, username: str):
+        """Flush and close one streamer's session file; the next event starts a new session file"""
+        queue = self._write_queues.pop(username, None)
+        task = self._writer_tasks.pop(username, None)
+        self.session_files.pop(username, None)
+        if queue is not None:
+            queue.put_nowait(None)
+        if task is not None:
+            # Keep track of it until it finishes, even if this caller is cancelled first
+            self._closing_writers.add(task)
+            task.add_done_callback(self._closing_writers.discard)
+            await asyncio.gather(task, return_exceptions=True)
+            
+    async def _close_writers(self):
+        """Flush and close all session files, including ones a disconnect handler is already closing"""
+        await asyncio.gather(*(self._close_writer(username) for username in list(self._write_queues)))
+        if self._closing_writers:
+            await asyncio.gather(*list(self._closing_writers), return_exceptions=True)
+            
     async def _is_duplicate_comment(self, username: str, commenter: str, comment: str, current_time: float) -> bool:
         """Enhanced duplicate detection with multiple strategies"""
         
         # Initialize tracking for this streamer
-        if username not in self.recent_comments:
-            self.recent_comments[username] = {}
+        buckets = self.recent_comments.get(username)
+        if buckets is None:
+            buckets = self.recent_comments[username] = {}
+            
+        bucket = int(current_time // DEDUP_BUCKET_SECONDS)
+        seen = buckets.get(bucket)
+        if seen is None:
+            seen = buckets[bucket] = {}
             
+        # The previous hour's entries only matter within 30s of the bucket boundary
+        previous = None
+        if current_time - bucket * DEDUP_BUCKET_SECONDS < 30:
+            previous = buckets.get(bucket - 1)
+        
         # Strategy 1: Exact match detection
-        exact_key = f"{commenter}|{comment.strip()}"
-        exact_hash = hashlib.md5(exact_key.encode('utf-8')).hexdigest()
+        exact_key = (commenter, comment.strip())
         
-        if exact_hash in self.recent_comments[username]:
-            last_seen = self.recent_comments[username][exact_hash]
-            if current_time - last_seen < 30:  # 30 second window
-                return True
+        last_seen = seen.get(exact_key)
+        if last_seen is None and previous:
+            last_seen = previous.get(exact_key)
+        if last_seen is not None and current_time - last_seen < 30:  # 30 second window
+            return True
                 
         # Strategy 2: Similar content detection (for spam/bots)
-        normalized_comment = unicodedata.normalize('NFC', comment.lower().strip())
-        similarity_key = f"{commenter}|{normalized_comment}"
-        similarity_hash = hashlib.md5(similarity_key.encode('utf-8')).hexdigest()
-        
-        if similarity_hash in self.recent_comments[username]:
-            last_seen = self.recent_comments[username][similarity_hash]
-            if current_time - last_seen < 10:  # 10 second window for similar content
-                return True
-                
-        # Strategy 3: Rapid-fire detection (same user posting too quickly)
-        user_prefix = f"{commenter}|"
-        recent_from_user = [
-            timestamp for hash_val, timestamp in self.recent_comments[username].items()
-            if hash_val.startswith(hashlib.md5(user_prefix.encode('utf-8')).hexdigest()[:8])
-            and current_time - timestamp < 5  # 5 second window
-        ]
+        # (comment is already NFC-normalized by on_comment)
+        normalized_comment = comment.lower().strip()
+        similarity_key = (commenter, normalized_comment)
         
-        if len(recent_from_user) >= 3:  # More than 3 comments in 5 seconds
+        last_seen = seen.get(similarity_key)
+        if last_seen is None and previous:
+            last_seen = previous.get(similarity_key)
+        if last_seen is not None and current_time - last_seen < 10:  # 10 second window for similar content
             return True
+                
+        # Strategy 3: Rapid-fire detection (same user posting too quickly) - skipped when the
+        # commenter is unknown, since every such comment would share one user's budget
+        user_times = None
+        if commenter and commenter != UNKNOWN_COMMENTER:
+            user_times = self._recent_by_user[username][commenter]
+            while user_times and current_time - user_times[0] >= 5:  # 5 second window
+                user_times.popleft()
+            
+            if len(user_times) >= 3:  # More than 3 comments in 5 seconds
+                return True
             
-        # Store the hashes
-        self.recent_comments[username][exact_hash] = current_time
-        self.recent_comments[username][similarity_hash] = current_time
+        # Store the keys
+        seen[exact_key] = current_time
+        seen[similarity_key] = current_time
+        self._history_dirty = True
+        if user_times is not None:
+            user_times.append(current_time)
         
         # Cleanup old entries
         self._cleanup_old_comments(username, current_time)
@@ -418,30 +695,63 @@ class EnhancedTikTokScraper:
         return False
         
     def _cleanup_old_comments(self, username: str, current_time: float):
-        """Clean up old comment hashes to prevent memory bloat"""
-        if username not in self.recent_comments:
+        """Clean up old dedup entries to prevent memory bloat"""
+        buckets = self.recent_comments.get(username)
+        if not buckets:
             return
             
-        # Remove entries older than 1 hour
-        cutoff_time = current_time - 3600
-        old_hashes = [
-            comment_hash for comment_hash, timestamp 
-            in self.recent_comments[username].items() 
-            if timestamp < cutoff_time
-        ]
-        
-        for comment_hash in old_hashes:
-            del self.recent_comments[username][comment_hash]
-            
-        # Limit to 1000 most recent entries per streamer
-        if len(self.recent_comments[username]) > 1000:
-            sorted_comments = sorted(
-                self.recent_comments[username].items(), 
-                key=lambda x: x[1], 
-                reverse=True
-            )
-            self.recent_comments[username] = dict(sorted_comments[:500])
+        # Drop whole hour buckets older than the previous hour
+        bucket = int(current_time // DEDUP_BUCKET_SECONDS)
+        if len(buckets) > 2 or min(buckets) < bucket - 1:
+            for hour in list(buckets):
+                if hour < bucket - 1:
+                    del buckets[hour]
+                    
+            # Once per expired bucket: forget commenters with no comment inside the rapid-fire window
+            user_times = self._recent_by_user[username]
+            scratch = self._scratch_keys
+            scratch.clear()
+            for commenter, times in user_times.items():
+                if not times or current_time - times[-1] >= 5:
+                    scratch.append(commenter)
+            for commenter in scratch:
+                del user_times[commenter]
+            scratch.clear()
             
+        # Limit to 1000 most recent entries per streamer - drop the previous hour first,
+        # then evict the oldest current-hour entries in place down to 500
+        if sum(len(seen) for seen in buckets.values()) > 1000:
+            buckets.pop(bucket - 1, None)
+            seen = buckets.get(bucket)
+            if seen and len(seen) > 500:
+                victims = heapq.nsmallest(len(seen) - 500, seen.items(), key=lambda x: x[1])
+                for comment_key, _ in victims:
+                    del seen[comment_key]
+                    
+    @asynccontextmanager
+    async def _connection_slot(self):
+        """Hold one of the _conc_max connection slots for the duration of the block"""
+        async with self._conc_cond:
+            await self._conc_cond.wait_for(lambda: self._conc_active < self._conc_max)
+            self._conc_active += 1
+        try:
+            yield
+        finally:
+            async with self._conc_cond:
+                self._conc_active -= 1
+                self._conc_cond.notify(1)
+                
+    async def _adjust_concurrency(self, delta: int):
+        """Shrink or grow the connection limit, between 1 and the configured maximum"""
+        async with self._conc_cond:
+            new_max = max(1, min(self.config.max_concurrent_connections, self._conc_max + delta))
+            if new_max == self._conc_max:
+                return
+            self._conc_max = new_max
+            if delta > 0:
+                self._conc_cond.notify_all()
+        self.logger.info(f"🎚️ Connection concurrency limit now {new_max}")
+        
     async def create_streamer_client(self, username: str) -> tuple[bool, bool]:
         """Create and connect TikTok client with enhanced error handling and retries"""
         
@@ -449,7 +759,7 @@ class EnhancedTikTokScraper:
             self.logger.error("TikTokLive library not available")
             return False, False
             
-        async with self.connection_semaphore:
+        async with self._connection_slot():
             self.stats.connection_attempts += 1
             
             try:
@@ -463,8 +773,9 @@ class EnhancedTikTokScraper:
                     return False, True
                     
                 # Per-streamer rate limit check
-                if username in self.streamer_rate_limits and current_time < self.streamer_rate_limits[username]:
-                    remaining = self.streamer_rate_limits[username] - current_time
+                st = self._streamer_state(username)
+                if current_time < st.rate_limit_until:
+                    remaining = st.rate_limit_until - current_time
                     self.logger.debug(f"⏰ @{username} rate limited for {remaining/60:.1f} more minutes")
                     return False, True
                     
@@ -479,7 +790,8 @@ class EnhancedTikTokScraper:
                 await asyncio.sleep(random.uniform(delay_min, delay_max))
                 
                 self.logger.info(f"🔌 Connecting to @{username}...")
-                self.last_connection_time = time.time()
+                current_time = time.time()  # refreshed after the delays above
+                self.last_connection_time = st.last_conn = current_time
                 
                 # Create client
                 client = TikTokLiveClient(unique_id=username)
@@ -496,6 +808,8 @@ class EnhancedTikTokScraper:
                     timeout=self.config.connection_timeout
                 )
                 
+                # Recovered - restore one slot if rate limiting had reduced concurrency
+                await self._adjust_concurrency(+1)
                 return True, False
                 
             except Exception as e:
@@ -503,20 +817,18 @@ class EnhancedTikTokScraper:
                 error_msg = str(e)
                 
                 # Check for rate limiting indicators
-                rate_limit_indicators = [
-                    'rate_limit', 'rate limit', 'too many requests', '429',
-                    'sign server', 'rate_limit_ip_day', 'euler', 'blocked'
-                ]
-                
-                is_rate_limited = any(indicator in error_msg.lower() for indicator in rate_limit_indicators)
+                is_rate_limited = RATE_LIMIT_RE.search(error_msg) is not None
                 
                 if is_rate_limited:
                     self.stats.rate_limit_hits += 1
-                    current_time = time.time()
+                    current_time = time.time()  # refreshed after the connection attempt
                     
                     # Set rate limits
                     self.global_rate_limit_until = current_time + self.config.global_rate_limit_duration
-                    self.streamer_rate_limits[username] = current_time + self.config.per_streamer_rate_limit
+                    self._streamer_state(username).rate_limit_until = current_time + self.config.per_streamer_rate_limit
+                    
+                    # Back off on concurrency while rate limits keep coming
+                    await self._adjust_concurrency(-1)
                     
                     self.logger.warning(f"🚫 Rate limit detected for @{username}: {error_msg}")
                     return False, True
@@ -531,12 +843,9 @@ class EnhancedTikTokScraper:
         async def on_connect(event):
             try:
                 self.logger.info(f"✅ Connected to @{username}'s live stream")
-                self.active_sessions.add(username)
+                self._streamer_state(username).active = True
                 self.stats.active_connections += 1
-                await self.save_event(username, "system", "SCRAPER", f"Connected to live stream", {
-                    "event": "connect",
-                    "viewer_count": getattr(event, 'viewer_count', 0)
-                })
+                await self.save_event(username, "system", "Connected to live stream")
             except Exception as e:
                 self.logger.error(f"Error in connect handler for @{username}: {e}")
                 
@@ -544,12 +853,14 @@ class EnhancedTikTokScraper:
         async def on_disconnect(event):
             try:
                 self.logger.info(f"❌ Disconnected from @{username}'s live stream")
-                if username in self.active_sessions:
-                    self.active_sessions.remove(username)
+                st = self._streamer_state(username)
+                if st.active:
+                    st.active = False
                     self.stats.active_connections = max(0, self.stats.active_connections - 1)
-                await self.save_event(username, "system", "SCRAPER", f"Disconnected from live stream", {
-                    "event": "disconnect"
-                })
+                await self.save_event(username, "system", "Disconnected from live stream")
+                
+                # Release the session file handle while the streamer is offline
+                await self._close_writer(username)
             except Exception as e:
                 self.logger.error(f"Error in disconnect handler for @{username}: {e}")
                 
@@ -557,22 +868,25 @@ class EnhancedTikTokScraper:
         async def on_comment(event):
             try:
                 # Extract comment data safely
-                commenter = "unknown"
+                commenter = UNKNOWN_COMMENTER
                 comment = ""
-                extra_data = {}
                 
-                if hasattr(event, 'user') and event.user:
-                    commenter = getattr(event.user, 'username', getattr(event.user, 'display_name', 'unknown'))
-                    extra_data['user_id'] = getattr(event.user, 'user_id', None)
+                user = getattr(event, 'user', None)
+                if user:
+                    field = self._event_user_field.get(username)
+                    if field is None:
+                        field = 'username' if hasattr(user, 'username') else 'display_name'
+                        self._event_user_field[username] = field
+                    commenter = getattr(user, field, UNKNOWN_COMMENTER)
                     
                 if hasattr(event, 'comment'):
                     comment = str(event.comment)
                     
                 # Normalize Unicode text
-                commenter = unicodedata.normalize('NFC', str(commenter))
-                comment = unicodedata.normalize('NFC', comment)
+                commenter = _nfc(str(commenter))
+                comment = _nfc(comment)
                 
-                await self.save_event(username, "comment", commenter, comment, extra_data)
+                await self.save_event(username, "comment", comment, commenter)
                 
             except Exception as e:
                 self.logger.error(f"Error processing comment for @{username}: {e}")
@@ -584,30 +898,33 @@ class EnhancedTikTokScraper:
                 
     async def monitor_streamer(self, username: str):
         """Monitor a single streamer with intelligent retry and backoff"""
-        consecutive_failures = 0
-        consecutive_rate_limits = 0
         last_success_time = time.time()
         
         self.logger.info(f"🎯 Starting monitoring for @{username}")
         
+        # Stagger startup so all streamers don't connect at once
+        await asyncio.sleep(self.config.startup_jitter * random.random())
+        
         while self.running:
             try:
                 current_time = time.time()
+                st = self._streamer_state(username)
                 
                 # Adaptive retry delay based on failure history
-                if consecutive_failures > 0:
+                if st.consecutive_failures > 0:
                     delay = min(
-                        self.config.base_delay * (self.config.backoff_multiplier ** consecutive_failures),
+                        self.config.base_delay * (self.config.backoff_multiplier ** st.consecutive_failures),
                         self.config.max_delay
                     )
                     jitter = random.uniform(*self.config.jitter_range)
                     actual_delay = delay * jitter
                     
-                    self.logger.info(f"⏳ @{username}: Waiting {actual_delay:.1f}s before retry (failures: {consecutive_failures})")
+                    self.logger.info(f"⏳ @{username}: Waiting {actual_delay:.1f}s before retry (failures: {st.consecutive_failures})")
                     await asyncio.sleep(actual_delay)
+                    current_time = time.time()  # refreshed after the backoff sleep
                     
                 # Rate limit cooldown check
-                if consecutive_rate_limits >= 3:
+                if st.consecutive_rate_limits >= 3:
                     cooldown_remaining = self.config.rate_limit_cooldown - (current_time - last_success_time)
                     if cooldown_remaining > 0:
                         self.logger.info(f"🕒 @{username}: Rate limit cooldown, {cooldown_remaining/60:.1f}m remaining")
@@ -618,23 +935,23 @@ class EnhancedTikTokScraper:
                 success, is_rate_limited = await self.create_streamer_client(username)
                 
                 if is_rate_limited:
-                    consecutive_rate_limits += 1
-                    consecutive_failures += 1
+                    st.consecutive_rate_limits += 1
+                    st.consecutive_failures += 1
                     continue
                     
                 if success:
                     self.logger.info(f"✅ Successfully monitoring @{username}")
-                    consecutive_failures = 0
-                    consecutive_rate_limits = 0
-                    last_success_time = time.time()
+                    st.consecutive_failures = 0
+                    st.consecutive_rate_limits = 0
+                    last_success_time = time.time()  # refreshed after the connection attempt
                     
                     # Monitor while connected
-                    while username in self.active_sessions and self.running:
+                    while st.active and self.running:
                         await asyncio.sleep(10)
                         
                     self.logger.info(f"🔄 @{username} stream ended, will retry")
                 else:
-                    consecutive_failures += 1
+                    st.consecutive_failures += 1
                     self.logger.debug(f"❌ @{username} not live or connection failed")
                     
                 # Cleanup client
@@ -646,7 +963,7 @@ class EnhancedTikTokScraper:
                     del self.active_clients[username]
                     
             except Exception as e:
-                consecutive_failures += 1
+                self._streamer_state(username).consecutive_failures += 1
                 self.logger.error(f"Error monitoring @{username}: {e}")
                 await asyncio.sleep(60)
                 
@@ -661,13 +978,14 @@ class EnhancedTikTokScraper:
                 if not self.running:
                     break
                     
+                current_time = time.time()
+                
                 # Calculate runtime
-                runtime = datetime.now() - self.stats.start_time if self.stats.start_time else timedelta(0)
+                runtime = timedelta(seconds=int(time.monotonic() - self._t0)) if self._t0 is not None else timedelta(0)
                 
                 # Rate limit status
-                current_time = time.time()
                 global_rl_remaining = max(0, self.global_rate_limit_until - current_time)
-                active_rl_count = sum(1 for t in self.streamer_rate_limits.values() if current_time < t)
+                active_rl_count = sum(1 for st in self.streamers.values() if current_time < st.rate_limit_until)
                 
                 # Status report - only showing comments since we're only capturing comments
                 self.logger.info(
@@ -684,21 +1002,42 @@ class EnhancedTikTokScraper:
                 if active_rl_count > 0:
                     self.logger.info(f"🚫 {active_rl_count} streamers rate limited")
                     
-                # Save comment history periodically
-                self._save_comment_history()
-                
-                # Save stats
-                await self._save_stats()
+                # Save comment history periodically; stats are written by _stats_flusher
+                await self._save_comment_history()
+                self._stats_dirty.set()
                 
             except Exception as e:
                 self.logger.error(f"Error in status reporter: {e}")
                 
+    async def _stats_flusher(self):
+        """Write stats once they are marked dirty, at most every stats_flush_interval seconds"""
+        while self.running:
+            try:
+                # Time out periodically so shutdown isn't held up waiting for a change
+                try:
+                    await asyncio.wait_for(self._stats_dirty.wait(), timeout=60)
+                except asyncio.TimeoutError:
+                    continue
+                    
+                await asyncio.sleep(self.config.stats_flush_interval)
+                self._stats_dirty.clear()
+                await self._save_stats()
+            except Exception as e:
+                self.logger.error(f"Error in stats flusher: {e}")
+                # Back off so a persistent error doesn't turn into a busy loop
+                await asyncio.sleep(self.config.stats_flush_interval)
+                
     async def _save_stats(self):
         """Save statistics to file"""
         try:
+            # Skip the write when nothing changed since the last save
+            stats = self.stats.to_dict()
+            if stats == self._last_saved_stats:
+                return
+                
             stats_file = self.output_dir / "scraper_stats.json"
-            with open(stats_file, 'w', encoding='utf-8') as f:
-                json.dump(self.stats.to_dict(), f, indent=2)
+            await asyncio.to_thread(self._write_json, stats_file, stats, True)
+            self._last_saved_stats = stats
         except Exception as e:
             self.logger.error(f"Error saving stats: {e}")
             
@@ -706,71 +1045,109 @@ class EnhancedTikTokScraper:
         """Main execution method"""
         try:
             self.logger.info("🚀 Starting Enhanced TikTok Scraper...")
-            self.stats.start_time = datetime.now()
+            self.stats.start_time = time.time()
+            self._t0 = time.monotonic()
+            self._create_loop_primitives()
+            self._setup_signal_handlers()
+            
+            # Load dedup history in a worker thread so a large file doesn't block the loop
+            await asyncio.to_thread(self._load_comment_history_sync)
             
             # Load streamers
             streamers = self.load_streamers()
+            # Intern usernames: one shared str per streamer across all per-streamer dicts
+            streamers = [sys.intern(username) for username in streamers]
             if not streamers:
                 self.logger.error("❌ No streamers configured. Please add usernames to streamers.txt")
                 return
                 
             self.stats.total_streamers = len(streamers)
-            self.logger.info(f"👥 Monitoring {len(streamers)} streamers: {', '.join(streamers)}")
+            # Bounded preview - a long streamer list shouldn't turn into one huge log line
+            preview = ', '.join(streamers[:20])
+            if len(streamers) > 20:
+                preview += f" … +{len(streamers) - 20} more"
+            self.logger.info("👥 Monitoring %d streamers: %s", len(streamers), preview)
             
-            # Create monitoring tasks
-            tasks = []
+            # Streamer monitors plus the status reporter and stats flusher
+            coros = [self.monitor_streamer(username) for username in streamers]
+            coros.append(self.status_reporter())
+            coros.append(self._stats_flusher())
             
-            # Add streamer monitoring tasks
-            for username in streamers:
-                task = asyncio.create_task(self.monitor_streamer(username))
-                tasks.append(task)
+            # Run until the tasks finish or a shutdown signal arrives, then cancel what's left
+            main_task = asyncio.create_task(self._run_tasks(coros))
+            shutdown_task = asyncio.create_task(self._shutdown_evt.wait())
+            try:
+                await asyncio.wait({main_task, shutdown_task}, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                shutdown_task.cancel()
                 
-            # Add status reporter task
-            status_task = asyncio.create_task(self.status_reporter())
-            tasks.append(status_task)
-            
-            # Run all tasks
-            await asyncio.gather(*tasks, return_exceptions=True)
+            if main_task.done():
+                main_task.result()  # re-raise task failures into the handler below
+            else:
+                main_task.cancel()
+                await asyncio.gather(main_task, return_exceptions=True)
             
         except KeyboardInterrupt:
             self.logger.info("🛑 Received shutdown signal")
         except Exception as e:
-            self.logger.error(f"💥 Fatal error: {e}")
-            self.logger.error(traceback.format_exc())
+            # TaskGroup failures arrive as an ExceptionGroup - report each underlying error
+            # (traceback formatted by the logger only when a handler emits it)
+            for error in getattr(e, 'exceptions', (e,)):
+                self.logger.error("💥 Fatal error: %s", error, exc_info=error)
         finally:
             await self._cleanup()
             
+    async def _run_tasks(self, coros: List):
+        """Run all tasks - TaskGroup on 3.11+ (cancels siblings if one fails), gather otherwise"""
+        if sys.version_info >= (3, 11):
+            async with asyncio.TaskGroup() as tg:
+                for coro in coros:
+                    tg.create_task(coro)
+        else:
+            await asyncio.gather(*coros, return_exceptions=True)
+            
+    async def _safe_disconnect(self, username: str, client: TikTokLiveClient):
+        """Disconnect one client, logging instead of raising on failure"""
+        try:
+            self.logger.info("Disconnecting from @%s", username)
+            await client.disconnect()
+        except Exception as e:
+            self.logger.error("Error disconnecting from @%s: %s", username, e)
+            
     async def _cleanup(self):
         """Cleanup resources and save final state"""
         self.logger.info("🧹 Cleaning up...")
         self.running = False
         
-        # Disconnect all clients
-        for username, client in self.active_clients.items():
-            try:
-                self.logger.info(f"Disconnecting from @{username}")
-                await client.disconnect()
-            except Exception as e:
-                self.logger.error(f"Error disconnecting from @{username}: {e}")
-                
+        # Disconnect all clients concurrently
+        await asyncio.gather(
+            *(self._safe_disconnect(username, client) for username, client in list(self.active_clients.items())),
+            return_exceptions=True
+        )
+        
         self.active_clients.clear()
-        self.active_sessions.clear()
+        for st in self.streamers.values():
+            st.active = False
+        
+        # Flush and close session files
+        await self._close_writers()
         
         # Save final state
-        self._save_comment_history()
-        await self._save_stats()
+        await asyncio.gather(self._save_comment_history(), self._save_stats())
         
         # Final statistics - only showing comments since we're only capturing comments
-        if self.stats.start_time:
-            runtime = datetime.now() - self.stats.start_time
-            self.logger.info(f"📈 Final Statistics (Runtime: {str(runtime).split('.')[0]}):")
-            self.logger.info(f"   💬 Comments: {self.stats.comments_captured}")
-            self.logger.info(f"   🚫 Duplicates filtered: {self.stats.duplicates_filtered}")
-            self.logger.info(f"   ⚠️ Rate limit hits: {self.stats.rate_limit_hits}")
-            self.logger.info(f"   🔌 Connection attempts: {self.stats.connection_attempts}")
-            self.logger.info(f"   ❌ Failed connections: {self.stats.failed_connections}")
+        if self._t0 is not None:
+            runtime = timedelta(seconds=int(time.monotonic() - self._t0))
+            self.logger.info("📈 Final Statistics (Runtime: %s):", runtime)
+            self.logger.info("   💬 Comments: %d", self.stats.comments_captured)
+            self.logger.info("   🚫 Duplicates filtered: %d", self.stats.duplicates_filtered)
+            self.logger.info("   ⚠️ Rate limit hits: %d", self.stats.rate_limit_hits)
+            self.logger.info("   🔌 Connection attempts: %d", self.stats.connection_attempts)
+            self.logger.info("   ❌ Failed connections: %d", self.stats.failed_connections)
             
         self.logger.info("✅ Cleanup complete")
+        
+        self._stop_logging()
 
 def main():
     """Main entry point"""
@@ -778,27 +1155,34 @@ def main():
         print("❌ TikTokLive library is required. Install with: pip install TikTokLive")
         sys.exit(1)
         
-    # Parse command line arguments
-    import argparse
-    parser = argparse.ArgumentParser(
-        description="Enhanced TikTok Live Stream Scraper",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
+    if not AIOFILES_AVAILABLE:
+        print("❌ aiofiles library is required. Install with: pip install aiofiles")
+        sys.exit(1)
+        
+    # Parse command line arguments - no arguments means all defaults, so skip building argparse
+    if len(sys.argv) == 1:
+        args = SimpleNamespace(streamers="streamers.txt", output="output", config="config.json")
+    else:
+        import argparse
+        parser = argparse.ArgumentParser(
+            description="Enhanced TikTok Live Stream Scraper",
+            formatter_class=argparse.RawDescriptionHelpFormatter,
+            epilog="""
 Examples:
   python enhanced_scraper.py                                    # Use default settings
   python enhanced_scraper.py --streamers custom_streamers.txt  # Custom streamers file
   python enhanced_scraper.py --output custom_output_dir        # Custom output directory
-        """
-    )
-    
-    parser.add_argument("--streamers", default="streamers.txt",
-                        help="Path to streamers configuration file")
-    parser.add_argument("--output", default="output",
-                        help="Output directory for scraped data")
-    parser.add_argument("--config", default="config.json",
-                        help="Configuration file path")
-    
-    args = parser.parse_args()
+            """
+        )
+        
+        parser.add_argument("--streamers", default="streamers.txt",
+                            help="Path to streamers configuration file")
+        parser.add_argument("--output", default="output",
+                            help="Output directory for scraped data")
+        parser.add_argument("--config", default="config.json",
+                            help="Configuration file path")
+        
+        args = parser.parse_args()
     
     # Create and run scraper
     scraper = EnhancedTikTokScraper(
@@ -808,7 +1192,14 @@ Examples:
     )
     
     try:
-        asyncio.run(scraper.run())
+        # Use uvloop's event loop when installed (loop_factory needs Python 3.11+)
+        if UVLOOP_AVAILABLE and sys.version_info >= (3, 11):
+            with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+                runner.run(scraper.run())
+        else:
+            if UVLOOP_AVAILABLE:
+                uvloop.install()
+            asyncio.run(scraper.run())
     except KeyboardInterrupt:
         print("\n🛑 Scraper stopped by user")
     except Exception as e: